@@ -33,7 +33,11 @@ class WatermarkETLManager:
 
     def connect(self):
         if not self.connection:
-            self.connection = snowflake.connector.connect(**self.snowflake_config)
+            self.connection = snowflake.connector.connect(
+                **self.snowflake_config,
+                # Tag every statement so slow ETL queries can be found in QUERY_HISTORY
+                session_parameters={'QUERY_TAG': f"fin-trade-extract:{self.table_name}"}
+            )
             logger.info("✅ Connected to Snowflake")
 
     def close(self):
@@ -47,7 +51,14 @@ class WatermarkETLManager:
                                skip_recent_hours: Optional[int] = None,
                                consecutive_failure_threshold: Optional[int] = None) -> List[Dict]:
         self.connect()
-        query = f"""
+        params = {
+            'table_name': self.table_name,
+            'skip_recent_hours': skip_recent_hours,
+            'failure_threshold': consecutive_failure_threshold,
+            'exchange': exchange_filter.upper() if exchange_filter else None,
+            'max_symbols': max_symbols
+        }
+        query = """
             SELECT 
                 SYMBOL,
                 EXCHANGE,
@@ -58,22 +69,22 @@ class WatermarkETLManager:
                 LAST_SUCCESSFUL_RUN,
                 CONSECUTIVE_FAILURES
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-            WHERE TABLE_NAME = '{self.table_name}'
+            WHERE TABLE_NAME = %(table_name)s
               AND API_ELIGIBLE = 'YES'
               AND (LAST_FISCAL_DATE IS NULL OR LAST_FISCAL_DATE < DATEADD(day, -135, CURRENT_DATE()))
         """
         if skip_recent_hours:
-            query += f"""
+            query += """
               AND (LAST_SUCCESSFUL_RUN IS NULL 
-                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -{skip_recent_hours}, CURRENT_TIMESTAMP()))
+                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -%(skip_recent_hours)s, CURRENT_TIMESTAMP()))
             """
         if exchange_filter and exchange_filter != 'ALL':
-            query += f"\n              AND UPPER(EXCHANGE) = '{exchange_filter.upper()}'"
+            query += "\n              AND UPPER(EXCHANGE) = %(exchange)s"
         if consecutive_failure_threshold is not None:
-            query += f"\n              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < {consecutive_failure_threshold})"
+            query += "\n              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < %(failure_threshold)s)"
         query += "\n            ORDER BY SYMBOL"
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
         logger.info(f"📅 Only symbols with LAST_FISCAL_DATE older than 135 days (or NULL)")
         if exchange_filter:
@@ -85,11 +96,9 @@ class WatermarkETLManager:
         if consecutive_failure_threshold is not None:
             logger.info(f"🚫 Consecutive failure threshold: {consecutive_failure_threshold}")
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
+        cursor.execute(query, params)
         symbols_to_process = []
-        for row in results:
+        for row in cursor:
             symbol = row[0]
             symbols_to_process.append({
                 'symbol': symbol,
@@ -97,6 +106,7 @@ class WatermarkETLManager:
                 'asset_type': row[2],
                 'status': row[3]
             })
+        cursor.close()
         logger.info(f"📈 Found {len(symbols_to_process)} symbols to process")
         return symbols_to_process
 
@@ -35,7 +35,11 @@ class WatermarkETLManager:
 
     def connect(self):
         if not self.connection:
-            self.connection = snowflake.connector.connect(**self.snowflake_config)
+            self.connection = snowflake.connector.connect(
+                **self.snowflake_config,
+                # Tag every statement so slow ETL queries can be found in QUERY_HISTORY
+                session_parameters={'QUERY_TAG': f"fin-trade-extract:{self.table_name}"}
+            )
             logger.info("✅ Connected to Snowflake")
 
     def close(self):
@@ -49,7 +53,14 @@ class WatermarkETLManager:
                                skip_recent_hours: Optional[int] = None,
                                consecutive_failure_threshold: Optional[int] = None) -> List[Dict]:
         self.connect()
-        query = f"""
+        params = {
+            'table_name': self.table_name,
+            'skip_recent_hours': skip_recent_hours,
+            'failure_threshold': consecutive_failure_threshold,
+            'exchange': exchange_filter.upper() if exchange_filter else None,
+            'max_symbols': max_symbols
+        }
+        query = """
             SELECT 
                 SYMBOL,
                 EXCHANGE,
@@ -60,7 +71,7 @@ class WatermarkETLManager:
                 LAST_SUCCESSFUL_RUN,
                 CONSECUTIVE_FAILURES
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-            WHERE TABLE_NAME = '{self.table_name}'
+            WHERE TABLE_NAME = %(table_name)s
               AND API_ELIGIBLE = 'YES'
         """
         query += """
@@ -68,20 +79,20 @@ class WatermarkETLManager:
                    OR LAST_FISCAL_DATE < DATEADD(day, -135, CURRENT_DATE()))
         """
         if consecutive_failure_threshold is not None:
-            query += f"""
-              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < {consecutive_failure_threshold})
+            query += """
+              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < %(failure_threshold)s)
             """
         if skip_recent_hours:
-            query += f"""
+            query += """
               AND (LAST_SUCCESSFUL_RUN IS NULL 
-                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -{skip_recent_hours}, CURRENT_TIMESTAMP()))
+                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -%(skip_recent_hours)s, CURRENT_TIMESTAMP()))
             """
         # Treat 'ALL' (case-insensitive) as no filter
         if exchange_filter and exchange_filter.upper() != 'ALL':
-            query += f"\n              AND UPPER(EXCHANGE) = '{exchange_filter.upper()}'"
+            query += "\n              AND UPPER(EXCHANGE) = %(exchange)s"
         query += "\n            ORDER BY SYMBOL"
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
         logger.info(f"📅 Fundamentals logic: Only symbols with LAST_FISCAL_DATE older than 135 days (or NULL)")
         if exchange_filter:
@@ -93,11 +104,9 @@ class WatermarkETLManager:
         if consecutive_failure_threshold is not None:
             logger.info(f"❌ Omit symbols with >= {consecutive_failure_threshold} consecutive failures")
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
+        cursor.execute(query, params)
         symbols_to_process = []
-        for row in results:
+        for row in cursor:
             symbol = row[0]
             symbols_to_process.append({
                 'symbol': symbol,
@@ -105,6 +114,7 @@ class WatermarkETLManager:
                 'asset_type': row[2],
                 'status': row[3]
             })
+        cursor.close()
         logger.info(f"📈 Found {len(symbols_to_process)} symbols to process")
         return symbols_to_process
 
@@ -298,10 +308,11 @@ def fetch_cash_flow_data(symbol: str, api_key: str) -> Optional[Dict]:
         return None
 
 
-def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str) -> bool:
+def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str,
+                 run_timestamp: Optional[str] = None) -> bool:
     """Upload cash flow data to S3 as CSV."""
     symbol = data['symbol']
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = run_timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
     s3_key = f"{prefix}{symbol}_{timestamp}.csv"
     
     try:
@@ -506,11 +517,14 @@ def main():
     logger.info("🚀 STEP 3: Extract cash flow data from Alpha Vantage")
     logger.info("=" * 60)
     
+    start_time = datetime.now()
+    # One S3 key timestamp for the whole run instead of a clock read per upload
+    run_timestamp = start_time.strftime('%Y%m%d_%H%M%S')
     results = {
         'total_symbols': len(symbols_to_process),
         'successful': 0,
         'failed': 0,
-        'start_time': datetime.now().isoformat(),
+        'start_time': start_time.isoformat(),
         'details': [],
         'successful_updates': []  # Track successful updates for bulk watermark update
     }
@@ -524,7 +538,7 @@ def main():
         data = fetch_cash_flow_data(symbol, api_key)
         if data:
             # Upload to S3
-            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix):
+            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix, run_timestamp):
                 # Track for bulk watermark update (don't update one-by-one)
                 results['successful_updates'].append({
                     'symbol': symbol,
@@ -551,9 +565,9 @@ def main():
             })
     
     # Save results
-    results['end_time'] = datetime.now().isoformat()
-    results['duration_minutes'] = (datetime.fromisoformat(results['end_time']) - 
-                                  datetime.fromisoformat(results['start_time'])).total_seconds() / 60
+    end_time = datetime.now()
+    results['end_time'] = end_time.isoformat()
+    results['duration_minutes'] = (end_time - start_time).total_seconds() / 60
     
     # STEP 4: Open NEW Snowflake connection to update watermarks
     logger.info("")
@@ -46,7 +46,11 @@ class WatermarkETLManager:
         
         Returns list of dicts with symbol information
         """
-        query = f"""
+        params = {
+            'table_name': self.table_name,
+            'max_symbols': max_symbols
+        }
+        query = """
             SELECT 
                 SYMBOL,
                 EXCHANGE,
@@ -55,7 +59,7 @@ class WatermarkETLManager:
                 LAST_SUCCESSFUL_RUN,
                 CONSECUTIVE_FAILURES
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-            WHERE TABLE_NAME = '{self.table_name}'
+            WHERE TABLE_NAME = %(table_name)s
               AND API_ELIGIBLE = 'YES'
         """
         
@@ -70,7 +74,7 @@ class WatermarkETLManager:
         query += "\n            ORDER BY SYMBOL"
         
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
         
         
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
@@ -79,13 +83,10 @@ class WatermarkETLManager:
             logger.info(f"🔒 Symbol limit: {max_symbols}")
         
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
-        
+        cursor.execute(query, params)
         symbols_to_process = []
         
-        for row in results:
+        for row in cursor:
             symbol = row[0]
             symbols_to_process.append({
                 'symbol': symbol,
@@ -94,6 +95,7 @@ class WatermarkETLManager:
                 'status': row[3]
             })
         
+        cursor.close()
         logger.info(f"📈 Found {len(symbols_to_process)} symbols to process")
         
         return symbols_to_process
@@ -268,6 +270,7 @@ def fetch_company_overview(symbol: str, api_key: str) -> Optional[Dict]:
     Returns dict with:
     - symbol: stock ticker
     - data: raw API response data
+    - raw: response body bytes, uploaded to S3 as-is
     - latest_quarter: most recent fiscal quarter date (for watermark tracking)
     """
     url = "https://www.alphavantage.co/query"
@@ -309,6 +312,7 @@ def fetch_company_overview(symbol: str, api_key: str) -> Optional[Dict]:
         return {
             'symbol': symbol,
             'data': data,
+            'raw': response.content,
             'latest_quarter': latest_quarter
         }
         
@@ -320,18 +324,19 @@ def fetch_company_overview(symbol: str, api_key: str) -> Optional[Dict]:
         return None
 
 
-def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str) -> bool:
+def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str,
+                 run_timestamp: Optional[str] = None) -> bool:
     """Upload company overview data to S3 as JSON."""
     symbol = data['symbol']
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = run_timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
     s3_key = f"{prefix}{symbol}_{timestamp}.json"
     
     try:
-        # Upload as JSON (cleaner than CSV for complex text fields)
+        # Upload the API's JSON body unchanged instead of re-serializing the parsed dict
         s3_client.put_object(
             Bucket=bucket,
             Key=s3_key,
-            Body=json.dumps(data['data']).encode('utf-8')
+            Body=data['raw']
         )
         
         logger.info(f"✅ Uploaded {symbol} to s3://{bucket}/{s3_key}")
@@ -371,7 +376,8 @@ def get_snowflake_connection():
         private_key=pkb,
         database=os.environ.get('SNOWFLAKE_DATABASE', 'FIN_TRADE_EXTRACT'),
         schema=os.environ.get('SNOWFLAKE_SCHEMA', 'RAW'),
-        warehouse=os.environ['SNOWFLAKE_WAREHOUSE']
+        warehouse=os.environ['SNOWFLAKE_WAREHOUSE'],
+        session_parameters={'QUERY_TAG': 'fin-trade-extract:COMPANY_OVERVIEW'}
     )
 
 
@@ -428,11 +434,14 @@ def main():
     logger.info("🚀 STEP 3: Extract company overview data from Alpha Vantage")
     logger.info("=" * 60)
     
+    start_time = datetime.now()
+    # One S3 key timestamp for the whole run instead of a clock read per upload
+    run_timestamp = start_time.strftime('%Y%m%d_%H%M%S')
     results = {
         'total_symbols': len(symbols_to_process),
         'successful': 0,
         'failed': 0,
-        'start_time': datetime.now().isoformat(),
+        'start_time': start_time.isoformat(),
         'details': [],
         'successful_updates': []  # Track successful updates for bulk watermark update
     }
@@ -449,7 +458,7 @@ def main():
         
         if data:
             # Upload to S3
-            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix):
+            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix, run_timestamp):
                 # Track for bulk watermark update (don't update one-by-one)
                 results['successful_updates'].append({
                     'symbol': symbol
@@ -473,9 +482,9 @@ def main():
             })
     
     # Save results
-    results['end_time'] = datetime.now().isoformat()
-    results['duration_minutes'] = (datetime.fromisoformat(results['end_time']) - 
-                                  datetime.fromisoformat(results['start_time'])).total_seconds() / 60
+    end_time = datetime.now()
+    results['end_time'] = end_time.isoformat()
+    results['duration_minutes'] = (end_time - start_time).total_seconds() / 60
     
     # STEP 4: Open NEW Snowflake connection to update watermarks
     logger.info("")
@@ -2,11 +2,9 @@ import os
 import sys
 import datetime
 import requests
-import pandas as pd
 import snowflake.connector
 import boto3
 import csv
-import json
 from io import StringIO
 import argparse
 
@@ -31,14 +29,14 @@ def cleanup_s3_json(bucket: str, prefix: str, s3_client) -> int:
     print(f"🧹 Cleaned up S3 bucket: s3://{bucket}/{prefix} ({deleted} .json files deleted)")
     return deleted
 
-def upload_to_s3_transcript(symbol: str, year: int, quarter: int, data: dict, s3_client, bucket: str, symbol_count: int = None) -> bool:
-    """Upload transcript data to S3 as JSON. Optionally include symbol count in log."""
+def upload_to_s3_transcript(symbol: str, year: int, quarter: int, body: bytes, s3_client, bucket: str, symbol_count: int = None) -> bool:
+    """Upload the raw transcript JSON bytes to S3. Optionally include symbol count in log."""
     try:
         s3_key = f"{S3_PREFIX}{symbol}_{year}Q{quarter}.json"
         s3_client.put_object(
             Bucket=bucket,
             Key=s3_key,
-            Body=json.dumps(data).encode('utf-8'),
+            Body=body,
             ContentType='application/json'
         )
         if symbol_count is not None:
@@ -58,7 +56,9 @@ def get_quarters(start_date, end_date):
     quarters = []
     year = start_date.year
     quarter = (start_date.month - 1) // 3 + 1
-    while (year < end_date.year) or (year == end_date.year and quarter <= ((end_date.month - 1) // 3 + 1)):
+    end_year = end_date.year
+    end_quarter = (end_date.month - 1) // 3 + 1
+    while (year < end_year) or (year == end_year and quarter <= end_quarter):
         quarters.append((year, quarter))
         quarter += 1
         if quarter > 4:
@@ -79,6 +79,13 @@ import time
 from requests.exceptions import RequestException
 
 def fetch_transcript(symbol, year, quarter, api_key, max_retries=3, backoff=2):
+    """
+    Fetch one quarter's transcript.
+
+    Returns (data, raw) where data is the parsed JSON and raw is the response
+    body as received, so it can be uploaded without re-serializing.
+    Returns (None, None) when nothing usable came back.
+    """
     params = {
         "function": "EARNINGS_CALL_TRANSCRIPT",
         "symbol": symbol,
@@ -89,8 +96,10 @@ def fetch_transcript(symbol, year, quarter, api_key, max_retries=3, backoff=2):
         try:
             response = requests.get(API_URL, params=params, timeout=30)
             time.sleep(0.6)  # Fixed delay to avoid rate limiting
-            if response.status_code == 200 and response.json():
-                return response.json()
+            if response.status_code == 200:
+                data = response.json()
+                if data:
+                    return data, response.content
             else:
                 # Optionally log non-200 responses
                 pass
@@ -99,8 +108,8 @@ def fetch_transcript(symbol, year, quarter, api_key, max_retries=3, backoff=2):
             if attempt < max_retries - 1:
                 time.sleep(backoff ** attempt)
             else:
-                return None
-    return None
+                return None, None
+    return None, None
 
 def bulk_update_watermarks(cur, successful_updates, failed_symbols):
     """
@@ -160,7 +169,7 @@ def bulk_update_watermarks(cur, successful_updates, failed_symbols):
             SET API_ELIGIBLE = 'SUS', UPDATED_AT = CURRENT_TIMESTAMP()
             WHERE TABLE_NAME = 'EARNINGS_CALL_TRANSCRIPT'
               AND SYMBOL IN ('{symbols_list}')
-              AND COALESCE(CONSECUTIVE_FAILURES, 0) >= {threshold}
+              AND CONSECUTIVE_FAILURES >= {threshold}
         """)
         print(f"🔒 Marked symbols as SUS if failures >= {threshold}.")
 
@@ -206,7 +215,8 @@ def main():
         account=os.getenv("SNOWFLAKE_ACCOUNT"),
         warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
         database="FIN_TRADE_EXTRACT",
-        schema="RAW"
+        schema="RAW",
+        session_parameters={'QUERY_TAG': 'fin-trade-extract:EARNINGS_CALL_TRANSCRIPT'}
     )
     cur = conn.cursor()
     max_symbols = os.getenv("MAX_SYMBOLS")
@@ -216,6 +226,7 @@ def main():
         max_symbols = None
 
     # New: skip symbols with latest fiscal date within X days (SQL logic)
+    params = {'exchange': exchange, 'max_symbols': max_symbols}
     query = """
         SELECT SYMBOL, IPO_DATE, LAST_FISCAL_DATE
         FROM ETL_WATERMARKS
@@ -224,7 +235,7 @@ def main():
           AND STATUS = 'Active'
     """
     if exchange != 'ALL':
-        query += f" AND UPPER(EXCHANGE) = '{exchange}'\n"
+        query += " AND UPPER(EXCHANGE) = %(exchange)s\n"
     query += """
           AND (LAST_FISCAL_DATE IS NULL 
                OR LAST_FISCAL_DATE < DATEADD(day, -135, CURRENT_DATE())
@@ -233,8 +244,8 @@ def main():
                    OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -168, CURRENT_TIMESTAMP()))
     """
     if max_symbols:
-        query += f"\n        LIMIT {max_symbols}"
-    cur.execute(query)
+        query += "\n        LIMIT %(max_symbols)s"
+    cur.execute(query, params)
     rows = cur.fetchall()
         # Initialize a list of symbols not found
     successful_updates = []
@@ -259,14 +270,14 @@ def main():
         first_date = None
         last_date = None
         for year, quarter in quarters:
-            data = fetch_transcript(symbol, year, quarter, api_key)
+            data, raw = fetch_transcript(symbol, year, quarter, api_key)
             if data and "transcript" in data and data["transcript"]:
                 found_data = True
-                fiscal_date = f"{year}-{'0' if quarter < 10 else ''}{(quarter-1)*3+1:02d}-01"
+                fiscal_date = f"{year}-{(quarter - 1) * 3 + 1:02d}-01"
                 if not first_date:
                     first_date = fiscal_date
                 last_date = fiscal_date
-                upload_to_s3_transcript(symbol, year, quarter, data, s3_client, bucket, symbol_count)
+                upload_to_s3_transcript(symbol, year, quarter, raw, s3_client, bucket, symbol_count)
         if found_data:
             successful_updates.append({
                 'symbol': symbol,
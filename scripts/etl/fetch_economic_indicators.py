@@ -42,16 +42,14 @@ ECONOMIC_INDICATOR_CONFIGS = {
 }
 
 # S3 upload helper
-def upload_to_s3(csv_content, indicator_name, function_name, maturity, interval):
-    s3_client = boto3.client("s3", region_name=AWS_REGION)
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+def upload_to_s3(s3_client, csv_content, indicator_name, function_name, maturity, interval, timestamp):
     maturity_part = f"_{maturity}" if maturity else ""
     s3_key = f"{S3_PREFIX}{indicator_name}_{function_name}{maturity_part}_{interval}_{timestamp}.csv"
     s3_client.put_object(Bucket=S3_BUCKET, Key=s3_key, Body=csv_content.encode("utf-8"), ContentType="text/csv")
     print(f"✅ Uploaded {indicator_name} to s3://{S3_BUCKET}/{s3_key}")
     return s3_key
 
-def fetch_economic_indicator(function_key):
+def fetch_economic_indicator(function_key, run_id):
     interval, display_name, maturity = ECONOMIC_INDICATOR_CONFIGS[function_key]
     if function_key.startswith("TREASURY_YIELD_"):
         actual_function = "TREASURY_YIELD"
@@ -83,10 +81,11 @@ def fetch_economic_indicator(function_key):
     df["interval"] = interval
     df["name"] = data.get("name", display_name)
     df["unit"] = data.get("unit", "")
-    df["run_id"] = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    df["run_id"] = run_id
     # Convert value to float, handle NaN
     df["value"] = pd.to_numeric(df["value"], errors="coerce")
-    df["date"] = pd.to_datetime(df["date"]).dt.date
+    # Alpha Vantage dates are ISO YYYY-MM-DD; pin the format so a malformed date fails loudly
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d").dt.date
     # Reorder columns to match schema
     columns = [
         "indicator_name", "function_name", "maturity", "date", "interval", "unit", "value", "name", "run_id"
@@ -96,12 +95,16 @@ def fetch_economic_indicator(function_key):
 
 def main():
     indicators = list(ECONOMIC_INDICATOR_CONFIGS.keys())
+    # One client (and connection pool) for every upload in the run
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    # A single UTC timestamp serves as both the run_id column and the S3 key suffix
+    run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     for function_key in indicators:
         print(f"Fetching {function_key}...")
-        df = fetch_economic_indicator(function_key)
+        df = fetch_economic_indicator(function_key, run_id)
         if df is not None and not df.empty:
             csv_content = df.to_csv(index=False)
-            upload_to_s3(csv_content, df.iloc[0]["indicator_name"], df.iloc[0]["function_name"], df.iloc[0]["maturity"], df.iloc[0]["interval"])
+            upload_to_s3(s3_client, csv_content, df.iloc[0]["indicator_name"], df.iloc[0]["function_name"], df.iloc[0]["maturity"], df.iloc[0]["interval"], run_id)
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,6 @@ Fetches ETF_PROFILE data using the ETL_WATERMARKS table for incremental processi
 
 import os
 import time
-import json
 import requests
 import boto3
 import snowflake.connector
@@ -39,7 +38,8 @@ def get_snowflake_connection():
         private_key=pkb,
         database=os.environ.get('SNOWFLAKE_DATABASE', 'FIN_TRADE_EXTRACT'),
         schema=os.environ.get('SNOWFLAKE_SCHEMA', 'RAW'),
-        warehouse=os.environ['SNOWFLAKE_WAREHOUSE']
+        warehouse=os.environ['SNOWFLAKE_WAREHOUSE'],
+        session_parameters={'QUERY_TAG': 'fin-trade-extract:ETF_PROFILE'}
     )
 
 def get_eligible_etf_symbols(conn, max_symbols=None):
@@ -57,6 +57,10 @@ def get_eligible_etf_symbols(conn, max_symbols=None):
     return symbols
 
 def fetch_etf_profile(symbol, api_key):
+    """Return (data, raw) for an ETF profile, or (None, None) if unavailable.
+
+    raw is the response body as received, uploaded as-is to avoid re-serializing data.
+    """
     url = API_URL
     params = {
         'function': FUNCTION,
@@ -70,22 +74,22 @@ def fetch_etf_profile(symbol, api_key):
         # Alpha Vantage returns an error message as a dict with 'Error Message' or 'Note' keys
         if not data or (isinstance(data, dict) and ("Error Message" in data or "Note" in data)):
             print(f"No ETF profile data for {symbol} (API error or note)")
-            return None
+            return None, None
         # Check for at least one expected ETF profile key
         if not ("holdings" in data or "net_assets" in data):
             print(f"No ETF profile data for {symbol} (missing expected keys)")
-            return None
-        return data
+            return None, None
+        return data, resp.content
     except Exception as e:
         print(f"Error fetching {symbol}: {e}")
-        return None
+        return None, None
 
-def upload_json_to_s3(symbol, data, s3_client, bucket, prefix):
+def upload_json_to_s3(symbol, body, s3_client, bucket, prefix):
     key = f"{prefix}{symbol}.json"
     s3_client.put_object(
         Bucket=bucket,
         Key=key,
-        Body=json.dumps(data).encode('utf-8')
+        Body=body
     )
     print(f"Uploaded {symbol} ETF profile to s3://{bucket}/{key}")
 
@@ -135,34 +139,38 @@ def main():
 
     print(f"Found {len(symbols)} eligible ETF symbols.")
     processed = []
+    delisted = []
     for idx, symbol in enumerate(symbols, 1):
         print(f"[{idx}] {symbol}")
-        data = fetch_etf_profile(symbol, api_key)
+        data, raw = fetch_etf_profile(symbol, api_key)
         # Check for delisted status in ETF profile data
         if data and (data.get('status', '').lower() == 'delisted' or data.get('delisted', False)):
             print(f"{symbol} is delisted. Marking API_ELIGIBLE as 'DEL'.")
-            cur = conn.cursor()
-            cur.execute("""
-                UPDATE FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-                SET API_ELIGIBLE = 'DEL'
-                WHERE TABLE_NAME = 'ETF_PROFILE' AND SYMBOL = %s
-            """, (symbol,))
-            conn.commit()
-            cur.close()
+            delisted.append(symbol)
             continue
         if data:
-            upload_json_to_s3(symbol, data, s3_client, s3_bucket, s3_prefix)
+            upload_json_to_s3(symbol, raw, s3_client, s3_bucket, s3_prefix)
             processed.append(symbol)
         else:
             print(f"Skipping {symbol} due to missing data.")
+    # Bulk mark delisted ETFs in one statement instead of an UPDATE + commit per symbol
+    if delisted:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
+            SET API_ELIGIBLE = 'DEL'
+            WHERE TABLE_NAME = 'ETF_PROFILE' AND SYMBOL IN (%s)
+        """, (delisted,))
+        conn.commit()
+        cur.close()
     # Bulk update watermarks for all processed symbols
     if processed:
         cur = conn.cursor()
-        cur.execute(f"""
+        cur.execute("""
             UPDATE FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
             SET LAST_SUCCESSFUL_RUN = CURRENT_TIMESTAMP(), CONSECUTIVE_FAILURES = 0
-            WHERE TABLE_NAME = 'ETF_PROFILE' AND SYMBOL IN ({','.join(['%s']*len(processed))})
-        """, processed)
+            WHERE TABLE_NAME = 'ETF_PROFILE' AND SYMBOL IN (%s)
+        """, (processed,))
         conn.commit()
         cur.close()
     conn.close()
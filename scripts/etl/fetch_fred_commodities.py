@@ -68,9 +68,7 @@ def write_csv_to_buffer(commodity, data):
             writer.writerow([commodity, date, value])
     return buf.getvalue()
 
-def upload_to_s3(csv_content, commodity):
-    s3_client = boto3.client("s3", region_name=AWS_REGION)
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+def upload_to_s3(s3_client, csv_content, commodity, timestamp):
     s3_key = f"{S3_PREFIX}{commodity}_{timestamp}.csv"
     s3_client.put_object(Bucket=S3_BUCKET, Key=s3_key, Body=csv_content.encode("utf-8"), ContentType="text/csv")
     logger.info(f"✅ Uploaded {commodity} to s3://{S3_BUCKET}/{s3_key}")
@@ -79,6 +77,9 @@ def upload_to_s3(csv_content, commodity):
 
 def main():
     logger.info("🚀 Starting FRED Commodities Fetch (Alpha Vantage)")
+    # One client (and connection pool) for every upload in the run
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     for commodity, function_name in COMMODITIES:
         logger.info(f"Fetching {commodity} ({function_name}) from Alpha Vantage...")
         data = fetch_commodity_series(function_name)
@@ -86,7 +87,7 @@ def main():
             logger.warning(f"No data for {commodity} ({function_name})")
             continue
         csv_content = write_csv_to_buffer(commodity, data)
-        upload_to_s3(csv_content, commodity)
+        upload_to_s3(s3_client, csv_content, commodity, timestamp)
     logger.info("🎉 FRED Commodities fetch complete! Data uploaded to S3.")
 
 if __name__ == "__main__":
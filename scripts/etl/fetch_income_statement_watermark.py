@@ -34,7 +34,11 @@ class WatermarkETLManager:
     def connect(self):
         """Establish Snowflake connection."""
         if not self.connection:
-            self.connection = snowflake.connector.connect(**self.snowflake_config)
+            self.connection = snowflake.connector.connect(
+                **self.snowflake_config,
+                # Tag every statement so slow ETL queries can be found in QUERY_HISTORY
+                session_parameters={'QUERY_TAG': f"fin-trade-extract:{self.table_name}"}
+            )
             logger.info("✅ Connected to Snowflake")
             
     def close(self):
@@ -59,7 +63,13 @@ class WatermarkETLManager:
         """
         self.connect()
         
-        query = f"""
+        params = {
+            'table_name': self.table_name,
+            'skip_recent_hours': skip_recent_hours,
+            'exchange': exchange_filter.upper() if exchange_filter else None,
+            'max_symbols': max_symbols
+        }
+        query = """
             SELECT 
                 SYMBOL,
                 EXCHANGE,
@@ -70,7 +80,7 @@ class WatermarkETLManager:
                 LAST_SUCCESSFUL_RUN,
                 CONSECUTIVE_FAILURES
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-            WHERE TABLE_NAME = '{self.table_name}'
+            WHERE TABLE_NAME = %(table_name)s
               AND API_ELIGIBLE = 'YES'
         """
         
@@ -84,19 +94,19 @@ class WatermarkETLManager:
         
         # Skip recently processed symbols if requested
         if skip_recent_hours:
-            query += f"""
+            query += """
               AND (LAST_SUCCESSFUL_RUN IS NULL 
-                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -{skip_recent_hours}, CURRENT_TIMESTAMP()))
+                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -%(skip_recent_hours)s, CURRENT_TIMESTAMP()))
             """
         
         # Treat 'ALL' (case-insensitive) as no filter
         if exchange_filter and exchange_filter.upper() != 'ALL':
-            query += f"\n              AND UPPER(EXCHANGE) = '{exchange_filter.upper()}'"
+            query += "\n              AND UPPER(EXCHANGE) = %(exchange)s"
         
         query += "\n            ORDER BY SYMBOL"
         
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
         
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
         logger.info(f"📅 Fundamentals logic: Only symbols with LAST_FISCAL_DATE older than 135 days (or NULL)")
@@ -108,13 +118,10 @@ class WatermarkETLManager:
             logger.info(f"⏭️  Skip recent: {skip_recent_hours} hours")
         
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
-        
+        cursor.execute(query, params)
         symbols_to_process = []
         
-        for row in results:
+        for row in cursor:
             symbol = row[0]
             symbols_to_process.append({
                 'symbol': symbol,
@@ -123,6 +130,7 @@ class WatermarkETLManager:
                 'status': row[3]
             })
         
+        cursor.close()
         logger.info(f"📈 Found {len(symbols_to_process)} symbols to process")
         
         return symbols_to_process
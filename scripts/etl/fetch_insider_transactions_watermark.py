@@ -8,6 +8,7 @@ import os
 import sys
 import time
 import json
+import re
 from datetime import datetime
 from io import StringIO
 import csv
@@ -35,7 +36,11 @@ class WatermarkETLManager:
     def connect(self):
         """Establish Snowflake connection."""
         if not self.connection:
-            self.connection = snowflake.connector.connect(**self.snowflake_config)
+            self.connection = snowflake.connector.connect(
+                **self.snowflake_config,
+                # Tag every statement so slow ETL queries can be found in QUERY_HISTORY
+                session_parameters={'QUERY_TAG': f"fin-trade-extract:{self.table_name}"}
+            )
             logger.info("✅ Connected to Snowflake")
             
     def close(self):
@@ -53,7 +58,14 @@ class WatermarkETLManager:
         Get symbols to process from ETL_WATERMARKS table.
         """
         self.connect()
-        query = f"""
+        params = {
+            'table_name': self.table_name,
+            'skip_recent_hours': skip_recent_hours,
+            'failure_threshold': consecutive_failure_threshold,
+            'exchange': exchange_filter.upper() if exchange_filter else None,
+            'max_symbols': max_symbols
+        }
+        query = """
             SELECT 
                 SYMBOL,
                 EXCHANGE,
@@ -62,24 +74,24 @@ class WatermarkETLManager:
                 LAST_SUCCESSFUL_RUN,
                 CONSECUTIVE_FAILURES
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-            WHERE TABLE_NAME = '{self.table_name}'
+            WHERE TABLE_NAME = %(table_name)s
               AND API_ELIGIBLE = 'YES'
         """
         if skip_recent_hours:
-            query += f"""
+            query += """
               AND (LAST_SUCCESSFUL_RUN IS NULL 
-                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -{skip_recent_hours}, CURRENT_TIMESTAMP()))
+                   OR LAST_SUCCESSFUL_RUN < DATEADD(hour, -%(skip_recent_hours)s, CURRENT_TIMESTAMP()))
             """
         if consecutive_failure_threshold is not None:
-            query += f"""
-              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < {consecutive_failure_threshold})
+            query += """
+              AND (CONSECUTIVE_FAILURES IS NULL OR CONSECUTIVE_FAILURES < %(failure_threshold)s)
             """
         # Treat 'ALL' (case-insensitive) as no filter
         if exchange_filter and exchange_filter.upper() != 'ALL':
-            query += f"\n              AND UPPER(EXCHANGE) = '{exchange_filter.upper()}'"
+            query += "\n              AND UPPER(EXCHANGE) = %(exchange)s"
         query += "\n            ORDER BY SYMBOL"
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
 
         logger.debug(f"[DEBUG] Watermark symbol query: {query}")
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
@@ -91,58 +103,26 @@ class WatermarkETLManager:
             logger.info(f"⏭️  Skip recent: {skip_recent_hours} hours")
 
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        logger.debug(f"[DEBUG] Watermark query results: {results}")
+        cursor.execute(query, params)
+        symbols_to_process = [{'symbol': row[0], 'exchange': row[1], 'asset_type': row[2], 'status': row[3]} for row in cursor]
         cursor.close()
-
-        symbols_to_process = [{'symbol': row[0], 'exchange': row[1], 'asset_type': row[2], 'status': row[3]} for row in results]
         logger.debug(f"[DEBUG] symbols_to_process: {symbols_to_process}")
         logger.info(f"📈 Found {len(symbols_to_process)} symbols to process")
         return symbols_to_process
     
-    def bulk_update_watermarks(self, successful_symbols: List[str], failed_symbols: List[str]):
+    def bulk_update_watermarks(self, successful_updates: List[Dict], failed_symbols: List[str]):
         """
         Bulk update watermarks for successful and failed symbols using a temporary table and batch update.
+        
+        Args:
+            successful_updates: List of dicts with {symbol, first_date, last_date}
+            failed_symbols: List of symbols that failed processing
         """
         if not self.connection:
             raise RuntimeError("❌ No active Snowflake connection. Call connect() first.")
 
-        import re
-        import pandas as pd
         cursor = self.connection.cursor()
-        s3_prefix = os.environ.get('S3_INSIDER_TRANSACTIONS_PREFIX', 'insider_transactions/')
-        s3_bucket = os.environ.get('S3_BUCKET', 'fin-trade-craft-landing')
-        s3_client = boto3.client('s3')
-
-        # Prepare data for successful symbols
-        update_rows = []
-        for symbol in successful_symbols:
-            response = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=f"{s3_prefix}{symbol}_")
-            files = response.get('Contents', [])
-            if not files:
-                logger.warning(f"No S3 files found for symbol {symbol}, skipping fiscal date update.")
-                continue
-            latest_file = max(files, key=lambda x: x['LastModified'])['Key']
-            obj = s3_client.get_object(Bucket=s3_bucket, Key=latest_file)
-            csv_data = obj['Body'].read().decode('utf-8')
-            reader = csv.DictReader(StringIO(csv_data))
-            cleaned_dates = []
-            for d in [row['transaction_date'] for row in reader if row.get('transaction_date')]:
-                d = d.strip()
-                d = re.sub(r'<.*?>', '', d)
-                match = re.match(r'^(\d{4}-\d{2}-\d{2})', d)
-                if match:
-                    d_clean = match.group(1)
-                    cleaned_dates.append(d_clean)
-                else:
-                    logger.warning(f"Skipping malformed date: {d}")
-            if not cleaned_dates:
-                logger.warning(f"No valid transaction_date found in S3 file for symbol {symbol}, skipping fiscal date update.")
-                continue
-            min_date_fmt = min(cleaned_dates)
-            max_date_fmt = max(cleaned_dates)
-            update_rows.append((symbol, min_date_fmt, max_date_fmt))
+        update_rows = [(u['symbol'], u['first_date'], u['last_date']) for u in successful_updates]
 
         if update_rows:
             # Create temp table
@@ -272,9 +252,37 @@ def fetch_insider_transactions_data(symbol: str, api_key: str) -> Optional[List[
         return None
 
 
-def upload_to_s3(symbol: str, data: List[Dict], s3_client, bucket: str, prefix: str) -> bool:
+TRANSACTION_DATE_TAG_RE = re.compile(r'<.*?>')
+TRANSACTION_DATE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+
+
+def get_transaction_date_range(symbol: str, data: List[Dict]) -> Optional[Dict]:
+    """
+    Get the earliest and latest transaction_date from the fetched records.
+    
+    Dates are cleaned of stray HTML tags and trimmed to YYYY-MM-DD.
+    Returns {symbol, first_date, last_date}, or None if no valid date was found.
+    """
+    cleaned_dates = []
+    for record in data:
+        d = record.get('transaction_date')
+        if not d:
+            continue
+        match = TRANSACTION_DATE_RE.match(TRANSACTION_DATE_TAG_RE.sub('', str(d).strip()))
+        if match:
+            cleaned_dates.append(match.group(1))
+        else:
+            logger.warning(f"Skipping malformed date: {d}")
+    if not cleaned_dates:
+        return None
+    return {'symbol': symbol, 'first_date': min(cleaned_dates), 'last_date': max(cleaned_dates)}
+
+
+def upload_to_s3(symbol: str, data: List[Dict], s3_client, bucket: str, prefix: str,
+                 run_timestamp: Optional[str] = None) -> bool:
     """Upload insider transactions data to S3 as CSV."""
-    s3_key = f"{prefix}{symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    timestamp = run_timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    s3_key = f"{prefix}{symbol}_{timestamp}.csv"
     
     try:
         csv_buffer = StringIO()
@@ -354,7 +362,9 @@ def main():
         logger.warning("⚠️  No symbols to process")
         return
 
-    results = {'total_symbols': len(symbols_to_process), 'successful': 0, 'failed': 0, 'successful_symbols': [], 'failed_symbols': []}
+    # One S3 key timestamp for the whole run instead of a clock read per upload
+    run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results = {'total_symbols': len(symbols_to_process), 'successful': 0, 'failed': 0, 'successful_symbols': [], 'failed_symbols': [], 'successful_updates': []}
 
     for i, symbol_info in enumerate(symbols_to_process, 1):
         symbol = symbol_info['symbol']
@@ -363,10 +373,16 @@ def main():
 
         data = fetch_insider_transactions_data(symbol, api_key)
 
-        if data and upload_to_s3(symbol, data, s3_client, s3_bucket, s3_prefix):
+        if data and upload_to_s3(symbol, data, s3_client, s3_bucket, s3_prefix, run_timestamp):
             logger.info(f"[{i}] pulled {symbol} ({len(data)} records)")
             results['successful'] += 1
             results['successful_symbols'].append(symbol)
+            # Capture the fiscal date range now so the watermark update needs no S3 re-read
+            date_range = get_transaction_date_range(symbol, data)
+            if date_range:
+                results['successful_updates'].append(date_range)
+            else:
+                logger.warning(f"No valid transaction_date found for symbol {symbol}, skipping fiscal date update.")
         elif data is None:
             logger.info(f"[{i}] no data for {symbol}")
             results['failed'] += 1
@@ -381,7 +397,7 @@ def main():
     logger.debug(f"[DEBUG] Connection before commit: {watermark_manager.connection}")
     try:
         watermark_manager.connect()
-        watermark_manager.bulk_update_watermarks(results['successful_symbols'], results['failed_symbols'])
+        watermark_manager.bulk_update_watermarks(results['successful_updates'], results['failed_symbols'])
         logger.debug("[DEBUG] Committing watermark updates...")
         watermark_manager.connection.commit()
         logger.debug(f"[DEBUG] Connection after commit: {watermark_manager.connection}")
@@ -34,7 +34,11 @@ class WatermarkETLManager:
     def connect(self):
         """Establish Snowflake connection."""
         if not self.connection:
-            self.connection = snowflake.connector.connect(**self.snowflake_config)
+            self.connection = snowflake.connector.connect(
+                **self.snowflake_config,
+                # Tag every statement so slow ETL queries can be found in QUERY_HISTORY
+                session_parameters={'QUERY_TAG': f"fin-trade-extract:{self.table_name}"}
+            )
             logger.info("✅ Connected to Snowflake")
             
     def close(self):
@@ -66,11 +70,18 @@ class WatermarkETLManager:
         - last_fiscal_date: last data point date (or None)
         """
         self.connect()
+        params = {
+            'table_name': self.table_name,
+            'api_eligible': api_eligible,
+            'skip_recent_hours': skip_recent_hours,
+            'exchange': exchange_filter.upper() if exchange_filter else None,
+            'max_symbols': max_symbols
+        }
         
         # Build base query
         if enhanced_mode:
             # Enhanced mode: only symbols with fundamental data presence
-            query = f"""
+            query = """
                 SELECT DISTINCT
                     ts.SYMBOL,
                     ts.EXCHANGE,
@@ -81,8 +92,8 @@ class WatermarkETLManager:
                     ts.LAST_SUCCESSFUL_RUN,
                     ts.CONSECUTIVE_FAILURES
                 FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS ts
-                WHERE ts.TABLE_NAME = '{self.table_name}'
-                  AND ts.API_ELIGIBLE = '{api_eligible}'
+                WHERE ts.TABLE_NAME = %(table_name)s
+                  AND ts.API_ELIGIBLE = %(api_eligible)s
                   AND EXISTS (
                       SELECT 1 FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS fund
                       WHERE fund.SYMBOL = ts.SYMBOL
@@ -98,7 +109,7 @@ class WatermarkETLManager:
             """
         else:
             # Standard mode: all symbols
-            query = f"""
+            query = """
                 SELECT 
                     SYMBOL,
                     EXCHANGE,
@@ -109,8 +120,8 @@ class WatermarkETLManager:
                     LAST_SUCCESSFUL_RUN,
                     CONSECUTIVE_FAILURES
                 FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-                WHERE TABLE_NAME = '{self.table_name}'
-                  AND API_ELIGIBLE = '{api_eligible}'
+                WHERE TABLE_NAME = %(table_name)s
+                  AND API_ELIGIBLE = %(api_eligible)s
             """
         
         # Skip recently processed symbols if requested
@@ -118,25 +129,25 @@ class WatermarkETLManager:
             table_prefix = 'ts.' if enhanced_mode else ''
             query += f"""
               AND ({table_prefix}LAST_SUCCESSFUL_RUN IS NULL 
-                   OR {table_prefix}LAST_SUCCESSFUL_RUN < DATEADD(hour, -{skip_recent_hours}, CURRENT_TIMESTAMP()))
+                   OR {table_prefix}LAST_SUCCESSFUL_RUN < DATEADD(hour, -%(skip_recent_hours)s, CURRENT_TIMESTAMP()))
             """
         
         # Treat 'ALL' (case-insensitive) as no filter
         # Support ETF_AND_ALL_OTHER: exclude NASDAQ and NYSE
         if exchange_filter:
             table_prefix = 'ts.' if enhanced_mode else ''
-            ef = exchange_filter.upper()
+            ef = params['exchange']
             if ef == 'ALL':
                 pass  # No filter
             elif ef == 'ETF_AND_ALL_OTHER':
                 query += f"\n              AND UPPER({table_prefix}EXCHANGE) NOT IN ('NASDAQ', 'NYSE')"
             else:
-                query += f"\n              AND UPPER({table_prefix}EXCHANGE) = '{ef}'"
+                query += f"\n              AND UPPER({table_prefix}EXCHANGE) = %(exchange)s"
         
         query += "\n            ORDER BY SYMBOL"
         
         if max_symbols:
-            query += f"\n            LIMIT {max_symbols}"
+            query += "\n            LIMIT %(max_symbols)s"
         
         logger.info(f"📊 Querying watermarks for {self.table_name}...")
         if enhanced_mode:
@@ -147,15 +158,13 @@ class WatermarkETLManager:
             logger.info(f"🔒 Symbol limit: {max_symbols}")
         
         cursor = self.connection.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
-        cursor.close()
-        
+        cursor.execute(query, params)
         symbols_to_process = []
         full_count = 0
         compact_count = 0
+        today = datetime.now().date()
         
-        for row in results:
+        for row in cursor:
             symbol = row[0]
             first_fiscal = row[4]
             last_fiscal = row[5]
@@ -167,7 +176,7 @@ class WatermarkETLManager:
                 full_count += 1
             elif first_fiscal is not None and last_fiscal is not None:
                 # Previously processed - check staleness
-                days_since_last = (datetime.now().date() - last_fiscal).days
+                days_since_last = (today - last_fiscal).days
                 if days_since_last < staleness_days:
                     # Recent data - use compact mode
                     processing_mode = 'compact'
@@ -187,6 +196,7 @@ class WatermarkETLManager:
                 'last_fiscal_date': last_fiscal
             })
         
+        cursor.close()
         logger.info(f"📋 Found {len(symbols_to_process)} symbols to process:")
         logger.info(f"   🔄 Full refresh: {full_count} symbols")
         logger.info(f"   ⚡ Compact update: {compact_count} symbols")
@@ -453,11 +463,12 @@ def fetch_time_series_data(symbol: str, api_key: str, output_size: str = 'full')
         return None
 
 
-def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str) -> bool:
+def upload_to_s3(data: Dict, s3_client, bucket: str, prefix: str,
+                 run_timestamp: Optional[str] = None) -> bool:
     """Upload time series data to S3."""
     try:
         symbol = data['symbol']
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = run_timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
         s3_key = f"{prefix}{symbol}_{timestamp}.csv"
         
         # Convert records back to CSV
@@ -597,11 +608,14 @@ def main():
     
     rate_limiter = AlphaVantageRateLimiter()
     
+    start_time = datetime.now()
+    # One S3 key timestamp for the whole run instead of a clock read per upload
+    run_timestamp = start_time.strftime('%Y%m%d_%H%M%S')
     results = {
         'total_symbols': len(symbols_to_process),
         'successful': 0,
         'failed': 0,
-        'start_time': datetime.now().isoformat(),
+        'start_time': start_time.isoformat(),
         'details': [],
         'successful_updates': []
     }
@@ -620,7 +634,7 @@ def main():
         
         if data:
             # Upload to S3
-            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix):
+            if upload_to_s3(data, s3_client, s3_bucket, s3_prefix, run_timestamp):
                 results['successful'] += 1
                 results['details'].append({
                     'symbol': symbol,
@@ -644,9 +658,9 @@ def main():
                 'mode': mode
             })
     
-    results['end_time'] = datetime.now().isoformat()
-    results['duration_minutes'] = (datetime.fromisoformat(results['end_time']) - 
-                                  datetime.fromisoformat(results['start_time'])).total_seconds() / 60
+    end_time = datetime.now()
+    results['end_time'] = end_time.isoformat()
+    results['duration_minutes'] = (end_time - start_time).total_seconds() / 60
     
     # STEP 4: Open NEW Snowflake connection to update watermarks
     logger.info("")
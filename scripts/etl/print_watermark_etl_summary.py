@@ -1,7 +1,15 @@
+import argparse
 import json
 import sys
 
-RESULTS_PATH = sys.argv[1] if len(sys.argv) > 1 else '/tmp/watermark_etl_results.json'
+parser = argparse.ArgumentParser(description='Print the watermark ETL results summary')
+parser.add_argument('results_path', nargs='?', default='/tmp/watermark_etl_results.json',
+                    help='Path to the ETL results JSON file')
+parser.add_argument('--json', action='store_true',
+                    help='Emit the computed summary as JSON instead of human-readable lines')
+args = parser.parse_args()
+
+RESULTS_PATH = args.results_path
 try:
     with open(RESULTS_PATH, 'r') as f:
         results = json.load(f)
@@ -9,22 +17,42 @@ except Exception as e:
     print(f"❌ No results file found or error reading file: {e}")
     sys.exit(1)
 
-print("📈 Total symbols processed:", results.get("total_symbols", "N/A"))
-if "successful" in results and "total_symbols" in results:
-    pct = (results["successful"] / results["total_symbols"] * 100) if results["total_symbols"] else 0
-    print(f"✅ Successful: {results['successful']} ({pct:.1f}%)")
+# Compute the derived figures once; both output modes read from this dict
+total = results.get("total_symbols")
+successful = results.get("successful")
+duration = results.get("duration_minutes")
+summary = {
+    'total_symbols': total,
+    'successful': successful,
+    'failed': results.get('failed'),
+    'success_pct': None,
+    'duration_minutes': duration,
+    'symbols_per_minute': None,
+    'suspended_marked': results.get('suspended_marked', 0),
+}
+if successful is not None and total is not None:
+    summary['success_pct'] = round(successful / total * 100, 1) if total else 0
+if duration is not None and (total or 0) > 0 and duration > 0:
+    summary['symbols_per_minute'] = round(successful / duration, 1)
+
+if args.json:
+    print(json.dumps(summary, default=str))
+    sys.exit(0)
+
+print("📈 Total symbols processed:", total if total is not None else "N/A")
+if summary['success_pct'] is not None:
+    print(f"✅ Successful: {successful} ({summary['success_pct']:.1f}%)")
 else:
     print("✅ Successful: N/A")
 print(f"❌ Failed: {results.get('failed', 'N/A')}")
-if "duration_minutes" in results:
-    print(f"⏱️  Duration: {results['duration_minutes']:.1f} minutes")
-    if results.get('total_symbols', 0) > 0 and results.get('duration_minutes', 0) > 0:
-        efficiency = results['successful'] / results['duration_minutes']
-        print(f"⚡ Processing efficiency: {efficiency:.1f} symbols/minute")
-print(f"✅ Watermarks updated for {results.get('successful', 'N/A')} symbols")
+if duration is not None:
+    print(f"⏱️  Duration: {duration:.1f} minutes")
+    if summary['symbols_per_minute'] is not None:
+        print(f"⚡ Processing efficiency: {summary['symbols_per_minute']:.1f} symbols/minute")
+print(f"✅ Watermarks updated for {successful if successful is not None else 'N/A'} symbols")
 print("   - FIRST_FISCAL_DATE set (if NULL)")
 print("   - LAST_FISCAL_DATE updated to latest data")
 print("   - LAST_SUCCESSFUL_RUN = current timestamp")
 print("   - CONSECUTIVE_FAILURES reset to 0")
-if results.get('suspended_marked', 0) > 0:
-    print(f"🔒 Symbols marked as API_ELIGIBLE='SUS': {results['suspended_marked']}")
+if summary['suspended_marked'] > 0:
+    print(f"🔒 Symbols marked as API_ELIGIBLE='SUS': {summary['suspended_marked']}")
@@ -84,7 +84,9 @@ def main():
         account=os.environ["SNOWFLAKE_ACCOUNT"],
         warehouse=os.environ["SNOWFLAKE_WAREHOUSE"],
         database=os.environ["SNOWFLAKE_DATABASE"],
-        schema=os.environ["SNOWFLAKE_SCHEMA"]
+        schema=os.environ["SNOWFLAKE_SCHEMA"],
+        # Tag by runbook so the COPY loads show up next to the ETL queries in performance monitoring
+        session_parameters={'QUERY_TAG': f"fin-trade-extract:{pathlib.Path(sql_path).stem}"}
     )
     try:
         run_sql_file(sql_path, conn)
@@ -266,22 +266,24 @@ def create_data_source_watermarks(connection, data_source):
         rows_inserted = cursor.rowcount
         logger.info(f"✅ Inserted {rows_inserted} watermark records")
         
-        # Get summary
+        # Get summary: one COUNT(*) per API_ELIGIBLE status (YES/NO/DEL/SUS)
         summary_sql = f"""
-            SELECT 
-                COUNT(*) as TOTAL,
-                COUNT(CASE WHEN API_ELIGIBLE = 'YES' THEN 1 END) as ELIGIBLE,
-                COUNT(CASE WHEN API_ELIGIBLE = 'NO' THEN 1 END) as NOT_ELIGIBLE
+            SELECT API_ELIGIBLE, COUNT(*)
             FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
             WHERE TABLE_NAME = '{data_source}'
+            GROUP BY 1
+            ORDER BY 1
         """
         cursor.execute(summary_sql)
-        result = cursor.fetchone()
+        status_counts = cursor.fetchall()
         
         logger.info(f"📊 Summary:")
-        logger.info(f"   Total: {result[0]}")
-        logger.info(f"   API Eligible: {result[1]}")
-        logger.info(f"   Not Eligible: {result[2]}")
+        if not status_counts:
+            logger.info(f"   No watermark records for {data_source}")
+        else:
+            logger.info(f"   Total: {sum(count for _, count in status_counts)}")
+            for status, count in status_counts:
+                logger.info(f"   API_ELIGIBLE = {status}: {count}")
         
         cursor.close()
         
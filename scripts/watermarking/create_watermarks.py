@@ -25,8 +25,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import snowflake.connector
 
-# Add parent directories to path for imports
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Add parent directories to path for imports (once, even if re-imported)
+_project_root = str(Path(__file__).parent.parent.parent)
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
 
 # Configure logging
 logging.basicConfig(
@@ -223,22 +225,11 @@ class WatermarkManager:
     
     def _get_active_symbols(self) -> List[str]:
         """Get list of active symbols from LISTING_STATUS table."""
+        cursor = self.connection.cursor()
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if LISTING_STATUS table exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_SCHEMA = 'RAW' AND TABLE_NAME = 'LISTING_STATUS'
-            """)
-            
-            if cursor.fetchone()[0] == 0:
-                logger.info("📝 LISTING_STATUS table not found - skipping symbol initialization")
-                cursor.close()
-                return []
-            
-            # Get active symbols
+            # Query directly - a missing LISTING_STATUS table surfaces as
+            # "does not exist" (errno 2003) instead of costing a separate
+            # INFORMATION_SCHEMA round-trip on every run
             cursor.execute("""
                 SELECT DISTINCT SYMBOL 
                 FROM FIN_TRADE_EXTRACT.RAW.LISTING_STATUS
@@ -252,37 +243,46 @@ class WatermarkManager:
             
             symbols = [row[0] for row in cursor.fetchall()]
             logger.info(f"📊 Found {len(symbols)} active symbols")
-            cursor.close()
             return symbols
             
+        except snowflake.connector.errors.ProgrammingError as e:
+            if e.errno == 2003:
+                logger.info("📝 LISTING_STATUS table not found - skipping symbol initialization")
+            else:
+                logger.warning(f"⚠️ Could not get active symbols: {e}")
+            return []
         except Exception as e:
             logger.warning(f"⚠️ Could not get active symbols: {e}")
             return []
+        finally:
+            cursor.close()
     
     def _insert_initial_watermarks(self, data_type: str, symbols: List[str]):
         """Insert initial watermark records for symbols."""
         logger.info(f"💾 Inserting initial watermarks for {len(symbols)} symbols...")
         
-        # Use MERGE to avoid duplicates
-        merge_sql = """
-        MERGE INTO FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS AS target
-        USING (SELECT ? as symbol, ? as data_type) AS source
-        ON target.SYMBOL = source.symbol AND target.DATA_TYPE = source.data_type
-        WHEN NOT MATCHED THEN
-            INSERT (SYMBOL, DATA_TYPE, PROCESSING_STATUS, LAST_UPDATED, CREATED_AT)
-            VALUES (source.symbol, source.data_type, 'pending', CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-        """
-        
         try:
             cursor = self.connection.cursor()
             
-            # Insert in batches of 100 to avoid timeout
+            # One MERGE per batch of 100 (avoids timeouts) instead of one MERGE per symbol;
+            # MERGE ... WHEN NOT MATCHED avoids duplicates
             batch_size = 100
             for i in range(0, len(symbols), batch_size):
                 batch = symbols[i:i + batch_size]
-                
-                for symbol in batch:
-                    cursor.execute(merge_sql, (symbol, data_type))
+                values_clause = ', '.join(['(%s, %s)'] * len(batch))
+                merge_sql = f"""
+                MERGE INTO FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS AS target
+                USING (
+                    SELECT column1 AS symbol, column2 AS data_type
+                    FROM VALUES {values_clause}
+                ) AS source
+                ON target.SYMBOL = source.symbol AND target.DATA_TYPE = source.data_type
+                WHEN NOT MATCHED THEN
+                    INSERT (SYMBOL, DATA_TYPE, PROCESSING_STATUS, LAST_UPDATED, CREATED_AT)
+                    VALUES (source.symbol, source.data_type, 'pending', CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
+                """
+                params = [value for symbol in batch for value in (symbol, data_type)]
+                cursor.execute(merge_sql, params)
                 
                 self.connection.commit()
                 logger.info(f"💾 Inserted batch {i//batch_size + 1}/{(len(symbols) + batch_size - 1)//batch_size}")
@@ -93,6 +93,27 @@ WHERE START_TIME >= DATEADD('day', -1, CURRENT_TIMESTAMP())
 ORDER BY TOTAL_ELAPSED_TIME DESC
 LIMIT 10;
 
+-- Slowest ETL statements by QUERY_TAG. Sessions are tagged
+-- 'fin-trade-extract:<TABLE_NAME | runbook file stem>':
+--   * ETL scripts use the upper-case table name they load, e.g. 'fin-trade-extract:BALANCE_SHEET',
+--     'fin-trade-extract:EARNINGS_CALL_TRANSCRIPT', 'fin-trade-extract:ETF_PROFILE'
+--   * snowflake_run_sql_file.py uses the lower-case runbook file stem for the S3 COPY/MERGE loads,
+--     e.g. 'fin-trade-extract:load_time_series_from_s3'
+SELECT 
+    'Slowest Tagged ETL Queries (Last 7 Days)' AS METRIC_NAME,
+    QUERY_TAG,
+    QUERY_PARAMETERIZED_HASH,
+    COUNT(*) AS CALLS,
+    AVG(TOTAL_ELAPSED_TIME / 1000) AS MEAN_ELAPSED_SECONDS,
+    SUM(TOTAL_ELAPSED_TIME / 1000) AS TOTAL_ELAPSED_SECONDS,
+    LEFT(ANY_VALUE(QUERY_TEXT), 100) || '...' AS QUERY_PREVIEW
+FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY
+WHERE START_TIME >= DATEADD('day', -7, CURRENT_TIMESTAMP())
+  AND QUERY_TAG LIKE 'fin-trade-extract:%'
+GROUP BY QUERY_TAG, QUERY_PARAMETERIZED_HASH
+ORDER BY MEAN_ELAPSED_SECONDS DESC
+LIMIT 10;
+
 -- Query patterns and frequency
 SELECT 
     'Query Patterns (Last 7 Days)' AS METRIC_NAME,
@@ -107,6 +128,26 @@ WHERE START_TIME >= DATEADD('day', -7, CURRENT_TIMESTAMP())
 GROUP BY DATE, QUERY_TYPE
 ORDER BY DATE DESC, QUERY_COUNT DESC;
 
+-- Warehouse cache hit ratio (share of scanned bytes served from local disk cache)
+SELECT
+    'Warehouse Cache Hit Ratio (Last 7 Days)' AS METRIC_NAME,
+    DATE_TRUNC('day', START_TIME) AS DATE,
+    COUNT(*) AS SCANNING_QUERIES,
+    SUM(BYTES_SCANNED) / (1024*1024*1024) AS GB_SCANNED,
+    ROUND(100 * SUM(BYTES_SCANNED * PERCENTAGE_SCANNED_FROM_CACHE) / NULLIF(SUM(BYTES_SCANNED), 0), 1) AS CACHE_HIT_PCT,
+    CASE
+        WHEN SUM(BYTES_SCANNED * PERCENTAGE_SCANNED_FROM_CACHE) / NULLIF(SUM(BYTES_SCANNED), 0) < 0.95
+        THEN 'Below 95% - warehouse cache is cold (check AUTO_SUSPEND)'
+        ELSE 'Cache hit ratio healthy'
+    END AS RECOMMENDATION
+FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY
+WHERE START_TIME >= DATEADD('day', -7, CURRENT_TIMESTAMP())
+  AND WAREHOUSE_NAME = 'FIN_TRADE_WH'
+  AND EXECUTION_STATUS = 'SUCCESS'
+  AND BYTES_SCANNED > 0
+GROUP BY DATE
+ORDER BY DATE DESC;
+
 -- ============================================================================
 -- STORAGE USAGE AND COST MONITORING
 -- ============================================================================
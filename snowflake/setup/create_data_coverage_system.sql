@@ -52,6 +52,10 @@ WHERE ls.symbol IS NOT NULL
   );
 
 -- 2) Enhanced Data Coverage View with Listing Dates
+-- The view has no ORDER BY: the downstream views aggregate or re-sort it, so a
+-- sort of the full universe would be thrown away. Ad-hoc queries such as
+-- SELECT * FROM DATA_COVERAGE_DASHBOARD are therefore no longer sorted by symbol.
+-- Add ORDER BY symbol at query time when order matters.
 CREATE OR REPLACE VIEW FIN_TRADE_EXTRACT.ANALYTICS.DATA_COVERAGE_DASHBOARD AS
 WITH symbol_universe AS (
     SELECT 
@@ -171,33 +175,42 @@ LEFT JOIN time_series_coverage ts ON u.symbol_id = ts.symbol_id
 LEFT JOIN balance_sheet_coverage bs ON u.symbol_id = bs.symbol_id  
 LEFT JOIN watermark_status wm_ls ON u.symbol_id = wm_ls.symbol_id AND wm_ls.table_name = 'LISTING_STATUS'
 LEFT JOIN watermark_status wm_ts ON u.symbol_id = wm_ts.symbol_id AND wm_ts.table_name = 'TIME_SERIES_DAILY_ADJUSTED'
-LEFT JOIN watermark_status wm_bs ON u.symbol_id = wm_bs.symbol_id AND wm_bs.table_name = 'BALANCE_SHEET'
-ORDER BY u.symbol;
+LEFT JOIN watermark_status wm_bs ON u.symbol_id = wm_bs.symbol_id AND wm_bs.table_name = 'BALANCE_SHEET';
 
 -- 3) Processing Status Analytics
+-- One pass over ETL_WATERMARKS grouped by failure count. The per-table totals
+-- and the failure distribution are both rolled up from that single aggregate.
 CREATE OR REPLACE VIEW FIN_TRADE_EXTRACT.ANALYTICS.ETL_PROCESSING_STATS AS
-WITH processing_summary AS (
+WITH failure_counts AS (
     SELECT 
         table_name,
-        COUNT(*) as total_symbols,
-        COUNT(CASE WHEN consecutive_failures = 0 THEN 1 END) as successful_symbols,
-        COUNT(CASE WHEN consecutive_failures > 0 THEN 1 END) as failed_symbols,
+        consecutive_failures,
+        COUNT(*) as symbols_count,
         MAX(last_successful_run) as most_recent_run,
-        MIN(last_successful_run) as oldest_run,
-        AVG(consecutive_failures) as avg_consecutive_failures,
-        MAX(consecutive_failures) as max_consecutive_failures
+        MIN(last_successful_run) as oldest_run
     FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-    GROUP BY table_name
+    GROUP BY table_name, consecutive_failures
 ),
 
-failure_distribution AS (
+processing_summary AS (
     SELECT 
         table_name,
-        consecutive_failures,
-        COUNT(*) as symbols_count
-    FROM FIN_TRADE_EXTRACT.RAW.ETL_WATERMARKS
-    WHERE consecutive_failures > 0
-    GROUP BY table_name, consecutive_failures
+        SUM(symbols_count) as total_symbols,
+        SUM(CASE WHEN consecutive_failures = 0 THEN symbols_count ELSE 0 END) as successful_symbols,
+        SUM(CASE WHEN consecutive_failures > 0 THEN symbols_count ELSE 0 END) as failed_symbols,
+        MAX(most_recent_run) as most_recent_run,
+        MIN(oldest_run) as oldest_run,
+        SUM(consecutive_failures * symbols_count)
+            / NULLIF(SUM(CASE WHEN consecutive_failures IS NOT NULL THEN symbols_count END), 0) as avg_consecutive_failures,
+        MAX(consecutive_failures) as max_consecutive_failures,
+        NULLIF(
+            LISTAGG(CASE WHEN consecutive_failures > 0 
+                         THEN consecutive_failures || ' failures: ' || symbols_count || ' symbols' END, ', ')
+                WITHIN GROUP (ORDER BY consecutive_failures),
+            ''
+        ) as failure_distribution
+    FROM failure_counts
+    GROUP BY table_name
 )
 
 SELECT 
@@ -213,15 +226,11 @@ SELECT
     ps.max_consecutive_failures,
     
     -- Failure distribution summary
-    STRING_AGG(fd.consecutive_failures || ' failures: ' || fd.symbols_count || ' symbols', ', ') 
-        WITHIN GROUP (ORDER BY fd.consecutive_failures) as failure_distribution,
+    ps.failure_distribution,
         
     CURRENT_TIMESTAMP() as report_generated_at
     
 FROM processing_summary ps
-LEFT JOIN failure_distribution fd ON ps.table_name = fd.table_name
-GROUP BY ps.table_name, ps.total_symbols, ps.successful_symbols, ps.failed_symbols,
-         ps.most_recent_run, ps.oldest_run, ps.avg_consecutive_failures, ps.max_consecutive_failures
 ORDER BY ps.table_name;
 
 -- 4) Stale Data Alert View  
@@ -267,7 +276,23 @@ WHERE (ts_staleness_days > 7 OR ts_staleness_days IS NULL OR
 ORDER BY ts_staleness_days DESC NULLS LAST, bs_staleness_days DESC NULLS LAST;
 
 -- 5) Data Coverage Summary
+-- The dashboard is read once through a shared CTE. Both branches of the
+-- UNION ALL reference it, so the underlying aggregations are not run twice.
 CREATE OR REPLACE VIEW FIN_TRADE_EXTRACT.ANALYTICS.DATA_COVERAGE_SUMMARY AS
+WITH coverage AS (
+    SELECT 
+        symbol,
+        ts_first_date,
+        ts_last_date,
+        ts_staleness_days,
+        ts_freshness,
+        bs_first_date,
+        bs_last_date,
+        bs_staleness_days,
+        bs_freshness
+    FROM FIN_TRADE_EXTRACT.ANALYTICS.DATA_COVERAGE_DASHBOARD
+    WHERE ts_first_date IS NOT NULL OR bs_first_date IS NOT NULL
+)
 SELECT 
     'Time Series' as data_type,
     COUNT(DISTINCT symbol) as total_symbols_with_data,
@@ -277,7 +302,7 @@ SELECT
     SUM(CASE WHEN ts_freshness = 'CURRENT' THEN 1 ELSE 0 END) as current_symbols,
     SUM(CASE WHEN ts_freshness = 'STALE' THEN 1 ELSE 0 END) as stale_symbols,
     SUM(CASE WHEN ts_freshness = 'VERY_STALE' THEN 1 ELSE 0 END) as very_stale_symbols
-FROM FIN_TRADE_EXTRACT.ANALYTICS.DATA_COVERAGE_DASHBOARD
+FROM coverage
 WHERE ts_first_date IS NOT NULL
 
 UNION ALL
@@ -291,7 +316,7 @@ SELECT
     SUM(CASE WHEN bs_freshness = 'CURRENT' THEN 1 ELSE 0 END) as current_symbols,
     SUM(CASE WHEN bs_freshness = 'STALE' THEN 1 ELSE 0 END) as stale_symbols,
     SUM(CASE WHEN bs_freshness = 'VERY_STALE' THEN 1 ELSE 0 END) as very_stale_symbols
-FROM FIN_TRADE_EXTRACT.ANALYTICS.DATA_COVERAGE_DASHBOARD
+FROM coverage
 WHERE bs_first_date IS NOT NULL;
 
 SELECT 'Comprehensive data coverage and watermarking system created successfully!' as status;
\ No newline at end of file